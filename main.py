@@ -2,10 +2,59 @@ import os
 import math
 import json
 import time
+import zlib
+import struct
+import asyncio
+import tempfile
+import queue
+import threading
+import importlib.util
 import requests
+import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image
 from io import BytesIO
-from typing import Tuple, List
+from typing import Tuple, List, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+try:
+    import httpx
+except ImportError:
+    # Fall back to a thread pool over requests when httpx is unavailable
+    httpx = None
+
+# httpx only speaks HTTP/2 when the h2 package is installed
+HTTP2 = importlib.util.find_spec('h2') is not None
+
+try:
+    import orjson
+except ImportError:
+    # Metadata is written with the standard json module without orjson
+    orjson = None
+
+
+# Tiles are always 256x256 pixels; TILE_SHIFT lets positions be computed with shifts
+TILE_SIZE = 256
+TILE_SHIFT = 8
+
+# Leading bytes of the image formats tile servers return, with the extension to save them under
+TILE_SIGNATURES = {
+    '.png': b'\x89PNG\r\n\x1a\n',
+    '.jpg': b'\xff\xd8\xff',
+    '.gif': b'GIF8',
+    '.webp': b'RIFF',
+}
+
+
+def tileExtension(content: bytes) -> str:
+    """File extension matching the image format of raw tile bytes, or None if not an image"""
+    for ext, signature in TILE_SIGNATURES.items():
+        if content.startswith(signature):
+            if ext == '.webp' and content[8:12] != b'WEBP':
+                continue
+            return ext
+    return None
 
 
 def safeRun(func):
@@ -18,6 +67,122 @@ def safeRun(func):
     return wrapper
 
 
+def writePng(path: str, pixels: np.ndarray, bandHeight: int = TILE_SIZE, compressLevel: int = 1):
+    """
+    Write an RGB array as a PNG, encoding one band of rows at a time
+
+    Works with memory-mapped arrays without ever loading the whole raster,
+    so peak memory stays around one band of rows.
+    """
+    height, width, _ = pixels.shape
+
+    def writeChunk(f, chunkType: bytes, data: bytes):
+        f.write(struct.pack('>I', len(data)))
+        f.write(chunkType)
+        f.write(data)
+        f.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunkType))))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        # 8-bit RGB, no interlacing
+        writeChunk(f, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+        compressor = zlib.compressobj(compressLevel)
+        prevRow = np.zeros((1, width*3), dtype=np.uint8)
+        for top in range(0, height, bandHeight):
+            band = np.asarray(pixels[top:top+bandHeight]).reshape(-1, width*3)
+
+            # Up filter (type 2): each byte minus the byte above it, wrapping mod 256.
+            # Neighbouring rows of imagery are similar, so this compresses far better
+            # than unfiltered rows.
+            rows = np.empty((band.shape[0], 1 + width*3), dtype=np.uint8)
+            rows[:, 0] = 2
+            np.subtract(band, np.concatenate((prevRow, band[:-1])), out=rows[:, 1:])
+            prevRow = band[-1:]
+
+            data = compressor.compress(rows.tobytes())
+            if data:
+                writeChunk(f, b'IDAT', data)
+
+        writeChunk(f, b'IDAT', compressor.flush())
+        writeChunk(f, b'IEND', b'')
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket that adapts to HTTP 429 responses
+
+    The rate is halved at most once per backoff window (at least
+    minBackoffWindow seconds, so a burst of 429s from concurrent requests
+    counts once) and creeps back up towards maxRate by recoverStep for every
+    successful request.
+    """
+
+    def __init__(self, maxRate: float = 50.0, minRate: float = 1.0, recoverStep: float = 1.0,
+                 minBackoffWindow: float = 1.0):
+        self.rate = maxRate
+        self.maxRate = maxRate
+        self.minRate = minRate
+        self.recoverStep = recoverStep
+        self.minBackoffWindow = minBackoffWindow
+        self.backoffUntil = 0.0
+        self.tokens = maxRate
+        self.updated = time.monotonic()
+        self.pausedUntil = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, returning how many seconds to wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated)*self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens/self.rate, self.pausedUntil - now)
+
+    def backoff(self, retryAfter: float = None):
+        """Lower the rate and pause all callers after a rate-limit response"""
+        with self.lock:
+            now = time.monotonic()
+            pause = retryAfter if retryAfter is not None else 1.0
+            if now >= self.backoffUntil:
+                self.rate = max(self.minRate, self.rate/2)
+                self.backoffUntil = now + max(pause, self.minBackoffWindow)
+            self.tokens = min(self.tokens, 0.0)
+            self.pausedUntil = max(self.pausedUntil, now + pause)
+
+    def recover(self):
+        """Raise the rate back towards maxRate after a successful request"""
+        with self.lock:
+            self.rate = min(self.maxRate, self.rate + self.recoverStep)
+
+    def acquire(self):
+        time.sleep(self.reserve())
+
+    async def acquireAsync(self):
+        await asyncio.sleep(self.reserve())
+
+
+class ProgressReporter:
+    """Thread-safe tile counter that prints progress at most maxRate times per second"""
+
+    def __init__(self, total: int, maxRate: float = 10.0):
+        self.total = total
+        self.count = 0
+        self.interval = 1.0/maxRate
+        self.lastPrint = 0.0
+        self.lock = threading.Lock()
+
+    def update(self, n: int = 1):
+        with self.lock:
+            self.count += n
+            now = time.monotonic()
+            if self.count < self.total and now - self.lastPrint < self.interval:
+                return
+            self.lastPrint = now
+            print(f"Download tile {self.count}/{self.total}")
+
+
 class SatelliteMapDownloader:
     """Downloads and manages satellite map tiles for offline use"""
 
@@ -25,6 +190,10 @@ class SatelliteMapDownloader:
         self.mapsFolder = mapsFolder
         self.ensureMapsFolder()
 
+        # On-disk tile cache, pruned oldest-first once it exceeds the size cap
+        self.cacheDir = os.path.join(mapsFolder, '_cache')
+        self.cacheMaxBytes = 512 * 1024 * 1024
+
         # Tile servers (you can add more providers)
         self.tileServers = {
             'openstreetmap': 'https://tile.openstreetmap.org/{z}/{x}/{y}.png',
@@ -36,6 +205,38 @@ class SatelliteMapDownloader:
         # Default to Google satellite for better quanlity
         self.currentServer = 'googleSat'
 
+        # Maximum number of tile requests in flight at once, multiplexed over
+        # maxConnections HTTP/2 connections when available
+        self.maxConcurrency = 64
+        self.maxConnections = 4
+
+        # Worker threads used when httpx is not installed
+        self.maxWorkers = 8
+
+        # Shared request rate limit; backs off on HTTP 429 instead of pausing every tile
+        self.limiter = RateLimiter(maxRate=50.0)
+        self.maxRateLimitRetries = 3
+
+        # Shared HTTP session so sequential tile requests reuse connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16, pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.2,
+                              status_forcelist=[500, 502, 503, 504]))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'User-Agent': 'Python Map Downloader 1.0'})
+
+    def close(self):
+        """Release pooled HTTP connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def ensureMapsFolder(self):
         """Create maps folder if it doesn't exist"""
         if not os.path.exists(self.mapsFolder):
@@ -59,44 +260,331 @@ class SatelliteMapDownloader:
 
     def calculateZoomLvl(self, bounds: dict, maxTiles: int = 20) -> int:
         """Calculate appropriate zoom level based on area size"""
-        latDiff = abs(bounds['north'] - bounds['south'])
-        lonDiff = abs(bounds['east'] - bounds['west'])
-
-        # Start with a reasonable zoom level and adjust
-        for zoom in range(10, 18):
+        # Tile count grows as 4^zoom, so solve for the largest zoom that fits:
+        # tiles ~= (lonDiff/360 * 2^zoom) * (mercatorLatDiff * 2^zoom)
+        lonFrac = abs(bounds['east'] - bounds['west'])/360.0
+        latMercFrac = abs(math.asinh(math.tan(math.radians(bounds['north'])))
+                          - math.asinh(math.tan(math.radians(bounds['south']))))/(2*math.pi)
+        areaFrac = lonFrac*latMercFrac
+
+        if areaFrac > 0:
+            zoom = int(math.floor(0.5*math.log2(maxTiles/areaFrac)))
+        else:
+            zoom = 17
+        zoom = min(max(zoom, 10), 17)
+
+        # The estimate ignores how the area aligns with tile edges, so verify
+        while zoom > 10:
             minX, minY = self.deg2num(bounds['north'], bounds['west'], zoom)
             maxX, maxY = self.deg2num(bounds['south'], bounds['east'], zoom)
+            if (maxX - minX + 1)*(maxY - minY + 1) <= maxTiles:
+                break
+            zoom -= 1
+
+        return zoom
 
-            tilesX = maxX - minX + 1
-            tilesY = maxY - minY + 1
-            totalTiles = tilesX * tilesY
+    def decodeTile(self, content: bytes) -> Image.Image:
+        """Decode raw tile bytes to an RGB image (lightgray placeholder if None or undecodable)"""
+        tile = None if content is None else self._tryDecodeTile(content)
+        if tile is None:
+            return Image.new('RGB', (TILE_SIZE, TILE_SIZE), color='lightgray')
+        return tile
 
-            if totalTiles <= maxTiles:
-                return zoom
+    def _tryDecodeTile(self, content: bytes) -> Image.Image:
+        """Decode raw tile bytes to a TILE_SIZE RGB image, or None if they are not a valid image"""
+        try:
+            tile = Image.open(BytesIO(content)).convert('RGB')
+        except Exception as e:
+            print(f"Error decoding tile: {e}")
+            return None
 
-        return 15  # Default zoom if calculation fails
+        # Some servers return high-DPI (e.g. 512x512) tiles; scale them to fit the grid
+        if tile.size != (TILE_SIZE, TILE_SIZE):
+            tile = tile.resize((TILE_SIZE, TILE_SIZE))
+        return tile
+
+    def _decodeTileAt(self, x: int, y: int, zoom: int, serverKey: str, content: bytes) -> Image.Image:
+        """
+        Decode a downloaded tile, or return None if it is missing or corrupt
+
+        Corrupt tiles are evicted from the cache so the next download refetches them.
+        """
+        if content is None:
+            return None
 
-    def downloadTile(self, x: int, y: int, zoom: int, serverKey: str = None) -> Image.Image:
-        """Download a single map tile"""
+        tile = self._tryDecodeTile(content)
+        if tile is None:
+            self._evictCachedTile(x, y, zoom, serverKey)
+        return tile
+
+    def _tileUrls(self, coords: List[Tuple[int, int]], zoom: int, serverKey: str = None) -> List[str]:
+        """Build the request URL for every tile up front, outside the fetch loop"""
         if serverKey is None:
             serverKey = self.currentServer
 
-        url = self.tileServers[serverKey].format(x=x, y=y, z=zoom)
+        template = self.tileServers[serverKey]
+        return [template.format(x=x, y=y, z=zoom) for x, y in coords]
 
+    @staticmethod
+    def _retryAfter(response) -> float:
+        """Seconds requested by a Retry-After header, or None if absent or not numeric"""
         try:
-            response = requests.get(url, headers={
-                'User-Agent': 'Python Map Downloader 1.0'
-            }, timeout=10)
-            response.raise_for_status()
+            return float(response.headers['Retry-After'])
+        except (KeyError, ValueError):
+            return None
+
+    def _downloadByUrl(self, url: str) -> bytes:
+        """Download raw bytes from a prebuilt tile URL over the shared session"""
+        for _ in range(self.maxRateLimitRetries + 1):
+            self.limiter.acquire()
+            response = self.session.get(url, timeout=10)
+            if response.status_code != 429:
+                self.limiter.recover()
+                break
+            self.limiter.backoff(self._retryAfter(response))
+
+        response.raise_for_status()
+        return response.content
+
+    def downloadTile(self, x: int, y: int, zoom: int, serverKey: str = None, url: str = None) -> bytes:
+        """
+        Download a single map tile as raw (still encoded) bytes
+
+        Tiles are cached verbatim; use decodeTile to get a PIL image.
+        Returns None if the download fails.
+        """
+        if serverKey is None:
+            serverKey = self.currentServer
 
-            # Convert to PIL Image
-            return Image.open(BytesIO(response.content))
+        content = self._readCachedTile(x, y, zoom, serverKey)
+        if content is not None:
+            return content
+
+        if url is None:
+            url = self.tileServers[serverKey].format(x=x, y=y, z=zoom)
+
+        try:
+            content = self._downloadByUrl(url)
 
         except Exception as e:
             print(f"Error Downloading tile {x}/{y}/{zoom}: {e}")
-            return Image.new('RGB', (256, 256), color='lightgray')
+            return None
+
+        self._writeCachedTile(x, y, zoom, serverKey, content)
+        return content
+
+    async def _fetchTile(self, client: 'httpx.AsyncClient', sem: asyncio.Semaphore,
+                         x: int, y: int, zoom: int, url: str, serverKey: str) -> bytes:
+        """Fetch the raw bytes of a single tile from its prebuilt URL, or None on failure"""
+        # Cache lookups and writes are blocking file I/O, so keep them off the event loop
+        content = await asyncio.to_thread(self._readCachedTile, x, y, zoom, serverKey)
+        if content is not None:
+            return content
+
+        async with sem:
+            try:
+                for _ in range(self.maxRateLimitRetries + 1):
+                    await self.limiter.acquireAsync()
+                    response = await client.get(url)
+                    if response.status_code != 429:
+                        self.limiter.recover()
+                        break
+                    self.limiter.backoff(self._retryAfter(response))
+
+                response.raise_for_status()
+                content = response.content
+            except Exception as e:
+                print(f"Error Downloading tile {x}/{y}/{zoom}: {e}")
+                content = None
+
+        if content is not None:
+            await asyncio.to_thread(self._writeCachedTile, x, y, zoom, serverKey, content)
+        return content
+
+    async def _fetchTiles(self, coords: List[Tuple[int, int]], urls: List[str], zoom: int,
+                          progress: ProgressReporter, results: queue.Queue, stop: threading.Event):
+        """Fetch all tiles concurrently, putting ((x, y), bytes) on results as each finishes"""
+        serverKey = self.currentServer
+        sem = asyncio.Semaphore(self.maxConcurrency)
+
+        # HTTP/2 (negotiated only over https with h2 installed) multiplexes many
+        # requests per connection; HTTP/1.1 needs one connection per request
+        http2 = HTTP2 and self.tileServers[serverKey].startswith('https://')
+        connections = self.maxConnections if http2 else self.maxConcurrency
+        limits = httpx.Limits(max_connections=connections,
+                              max_keepalive_connections=connections)
+        # Requests queued behind the connection limit wait without a pool timeout
+        timeout = httpx.Timeout(10, pool=None)
+        headers = {'User-Agent': 'Python Map Downloader 1.0'}
+
+        async def fetchOne(client, x, y, url):
+            return (x, y), await self._fetchTile(client, sem, x, y, zoom, url, serverKey)
+
+        async with httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout, headers=headers) as client:
+            tasks = [asyncio.ensure_future(fetchOne(client, x, y, url))
+                     for (x, y), url in zip(coords, urls)]
+            try:
+                for completed in asyncio.as_completed(tasks):
+                    item = await completed
+                    progress.update()
+
+                    # The queue is bounded; wait for the consumer without blocking the loop
+                    while True:
+                        if stop.is_set():
+                            return
+                        try:
+                            results.put_nowait(item)
+                            break
+                        except queue.Full:
+                            await asyncio.sleep(0.01)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _fetchTilesStreamed(self, coords: List[Tuple[int, int]], urls: List[str], zoom: int,
+                            progress: ProgressReporter) -> Iterator[Tuple[Tuple[int, int], bytes]]:
+        """
+        Fetch tiles with httpx, yielding ((x, y), bytes) as each completes
 
-    def downloadArea(self, bounds: dict, zoom: int = None, mapName: str = 'satelliteSnippet') -> dict:
+        The event loop runs on its own thread, which also keeps this usable from
+        code that already has a running loop (e.g. Jupyter). Tiles are handed
+        over through a bounded queue, so only a limited number of downloaded
+        tiles wait in memory for the caller.
+        """
+        results = queue.Queue(maxsize=self.maxConcurrency)
+        stop = threading.Event()
+        finished = object()
+
+        def fetch():
+            try:
+                asyncio.run(self._fetchTiles(coords, urls, zoom, progress, results, stop))
+                outcome = finished
+            except BaseException as e:
+                outcome = e
+
+            while not stop.is_set():
+                try:
+                    results.put(outcome, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+        worker = threading.Thread(target=fetch, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = results.get()
+                if item is finished:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            worker.join()
+
+    def _fetchTilesThreaded(self, coords: List[Tuple[int, int]], urls: List[str], zoom: int,
+                            progress: ProgressReporter) -> Iterator[Tuple[Tuple[int, int], bytes]]:
+        """Fetch tiles on a thread pool, yielding ((x, y), bytes) as each completes"""
+        serverKey = self.currentServer
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            futures = {executor.submit(self.downloadTile, x, y, zoom, serverKey, url): (x, y)
+                       for (x, y), url in zip(coords, urls)}
+            for future in as_completed(futures):
+                progress.update()
+                yield futures[future], future.result()
+
+    def _iterTiles(self, coords: List[Tuple[int, int]], zoom: int) -> Iterator[Tuple[Tuple[int, int], bytes]]:
+        """Fetch tiles concurrently, yielding ((x, y), bytes) pairs"""
+        urls = self._tileUrls(coords, zoom)
+        progress = ProgressReporter(len(coords))
+
+        if httpx is not None:
+            yield from self._fetchTilesStreamed(coords, urls, zoom, progress)
+        else:
+            yield from self._fetchTilesThreaded(coords, urls, zoom, progress)
+
+    def _tileCachePath(self, x: int, y: int, zoom: int, serverKey: str, ext: str) -> str:
+        """Path of a tile in the on-disk cache"""
+        return os.path.join(self.cacheDir, serverKey, str(zoom), str(x), f"{y}{ext}")
+
+    def _readCachedTile(self, x: int, y: int, zoom: int, serverKey: str) -> bytes:
+        """Return cached tile bytes, or None if the tile is not cached"""
+        for ext in TILE_SIGNATURES:
+            path = self._tileCachePath(x, y, zoom, serverKey, ext)
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+            except OSError:
+                continue
+
+            # Drop entries whose bytes don't match their image format
+            if tileExtension(content) != ext:
+                self._evictCachedTile(x, y, zoom, serverKey)
+                return None
+
+            # Refresh mtime so pruning evicts least recently used tiles first
+            os.utime(path)
+            return content
+
+        return None
+
+    def _writeCachedTile(self, x: int, y: int, zoom: int, serverKey: str, content: bytes):
+        """Atomically store tile bytes in the on-disk cache, named after their image format"""
+        ext = tileExtension(content)
+        if ext is None:
+            return
+
+        path = self._tileCachePath(x, y, zoom, serverKey, ext)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmpPath = path + '.tmp'
+            with open(tmpPath, 'wb') as f:
+                f.write(content)
+            os.replace(tmpPath, path)
+        except OSError as e:
+            print(f"Error caching tile {x}/{y}/{zoom}: {e}")
+
+    def _evictCachedTile(self, x: int, y: int, zoom: int, serverKey: str):
+        """Remove a tile from the on-disk cache, whatever its format"""
+        for ext in TILE_SIGNATURES:
+            try:
+                os.remove(self._tileCachePath(x, y, zoom, serverKey, ext))
+            except OSError:
+                pass
+
+    def pruneCache(self, maxBytes: int = None):
+        """Delete least recently used cached tiles until the cache fits in maxBytes"""
+        if maxBytes is None:
+            maxBytes = self.cacheMaxBytes
+
+        entries = []
+        totalBytes = 0
+        for root, _, files in os.walk(self.cacheDir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                totalBytes += stat.st_size
+
+        if totalBytes <= maxBytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            totalBytes -= size
+            if totalBytes <= maxBytes:
+                break
+
+    def downloadArea(self, bounds: dict, zoom: int = None, mapName: str = 'satelliteSnippet', stitch: bool = True) -> dict:
         """
         Download satellite imagery for a rectangular area
 
@@ -104,9 +592,13 @@ class SatelliteMapDownloader:
             bounds: Dictionary with keys 'north', 'south', 'east', 'west' (in decimal degrees)
             zoom: Zoom level (calculated automatically if None)
             mapName: Name for the saved map files
+            stitch: Stitch tiles into a single image; if False, tiles are written
+                to a {mapName}/{z}/{x}/{y}.<ext> tree instead, with the extension
+                matching each tile's image format
 
         Returns:
-            Dictionary with map information and file paths
+            Dictionary with map information and file paths ('imagePath' for a
+            stitched map, 'tileDir' for a tile tree)
         """
         print(f"Downloading map area: {bounds}")
 
@@ -126,34 +618,17 @@ class SatelliteMapDownloader:
 
         print(f"Total tiles to download: {totalTiles}")
 
-        # Create final image
-        finalWidth = tilesX*256
-        finalHeight = tilesY*256
-        finalImage = Image.new('RGB', (finalWidth, finalHeight))
-
-        # Download and stitch tiles
-        downloaded = 0
-        for x in range(minX, maxX+1):
-            for y in range(minY, maxY+1):
-                # Download tile
-                tile = self.downloadTile(x, y, zoom)
-
-                # Calculate position in final image
-                posX = (x - minX) * 256
-                posY = (y - minY) * 256
+        coords = [(x, y) for x in range(minX, maxX+1)
+                  for y in range(minY, maxY+1)]
 
-                # Paste tile into final image
-                finalImage.paste(tile, (posX, posY))
+        if stitch:
+            imagePath = self._stitchTiles(coords, zoom, minX, minY, tilesX, tilesY, mapName)
+            tileDir = None
+        else:
+            imagePath = None
+            tileDir = self._saveTileTree(coords, zoom, mapName)
 
-                downloaded += 1
-                print(f"Download tile {downloaded}/{totalTiles}")
-
-                # Be nice to servers
-                time.sleep(0.1)
-
-        # Save the stitched image
-        imagePath = os.path.join(self.mapsFolder, f"{mapName}.png")
-        finalImage.save(imagePath, "PNG")
+        self.pruneCache()
 
         # Calculate actual bounds of the downloaded area (tile boundaries)
         actualNorth, actualWest = self.num2deg(minX, minY, zoom)
@@ -163,6 +638,7 @@ class SatelliteMapDownloader:
         mapInfo = {
             'name': mapName,
             'imagePath': imagePath,
+            'tileDir': tileDir,
             'bounds': {
                 'north': actualNorth,
                 'south': actualSouth,
@@ -186,21 +662,113 @@ class SatelliteMapDownloader:
 
         # Save metadata
         metadataPath = os.path.join(self.mapsFolder, f"{mapName}_info.json")
-        with open(metadataPath, 'w') as f:
-            json.dump(mapInfo, f, indent=2)
-
-        print(f"Map saved: {imagePath}")
+        if orjson is not None:
+            with open(metadataPath, 'wb') as f:
+                f.write(orjson.dumps(mapInfo, option=orjson.OPT_INDENT_2))
+        else:
+            with open(metadataPath, 'w') as f:
+                json.dump(mapInfo, f, indent=2)
+
+        print(f"Map saved: {imagePath or tileDir}")
         print(f"Metadata saved: {metadataPath}")
 
         return mapInfo
 
-    def downloadFromCorners(self, corners: List[Tuple[float, float]], zoom: int = None, mapName: str = 'satelliteSnippet') -> dict:
+    def _stitchTiles(self, coords: List[Tuple[int, int]], zoom: int, minX: int, minY: int,
+                     tilesX: int, tilesY: int, mapName: str) -> str:
+        """Download tiles and stitch them into a single PNG, returning its path"""
+        # Create final image as a disk-backed RGB buffer, so the OS can page
+        # out rows that are already filled in
+        finalWidth = tilesX << TILE_SHIFT
+        finalHeight = tilesY << TILE_SHIFT
+        # The scratch file is anonymous, so nothing is left behind even if the process is killed
+        rawFile = tempfile.TemporaryFile(dir=self.mapsFolder, suffix='.raw')
+        canvas = np.memmap(rawFile, dtype=np.uint8, mode='w+',
+                           shape=(finalHeight, finalWidth, 3))
+
+        def placeTiles(canvas: np.ndarray, pending: dict, done) -> int:
+            """Copy decoded tiles into the canvas, returning how many decoded successfully"""
+            decoded = 0
+            for future in done:
+                x, y = pending.pop(future)
+
+                # Calculate position in final image
+                posX = (x - minX) << TILE_SHIFT
+                posY = (y - minY) << TILE_SHIFT
+
+                # Missing or corrupt tiles get the lightgray placeholder
+                tile = future.result()
+                if tile is None:
+                    tile = self.decodeTile(None)
+                else:
+                    decoded += 1
+
+                canvas[posY:posY+TILE_SIZE, posX:posX+TILE_SIZE] = np.asarray(tile)
+            return decoded
+
+        try:
+            # Both fetch paths yield tiles as they finish downloading. Decode them on a
+            # thread pool while later tiles are still downloading (decoders release
+            # the GIL), copying each into the final image on this thread. The number
+            # of decoded tiles waiting to be copied is bounded to keep memory flat.
+            workers = os.cpu_count() or 1
+            downloaded = 0
+            pending = {}
+            serverKey = self.currentServer
+            with ThreadPoolExecutor(max_workers=workers) as decoder:
+                for (x, y), content in self._iterTiles(coords, zoom):
+                    pending[decoder.submit(self._decodeTileAt, x, y, zoom, serverKey, content)] = (x, y)
+
+                    if len(pending) >= 2*workers:
+                        downloaded += placeTiles(canvas, pending, wait(pending, return_when=FIRST_COMPLETED).done)
+
+                downloaded += placeTiles(canvas, pending, wait(pending).done)
+
+            print(f"Downloaded {downloaded}/{len(coords)} tiles")
+
+            # Save the stitched image, streaming rows from the buffer
+            imagePath = os.path.join(self.mapsFolder, f"{mapName}.png")
+            writePng(imagePath, canvas)
+        finally:
+            del canvas
+            rawFile.close()
+
+        return imagePath
+
+    def _saveTileTree(self, coords: List[Tuple[int, int]], zoom: int, mapName: str) -> str:
+        """Download tiles straight to a {z}/{x}/{y}.<ext> tree, returning its root folder"""
+        tileDir = os.path.join(self.mapsFolder, mapName)
+
+        # Raw bytes go to disk as-is, so no full-size canvas is ever allocated
+        downloaded = 0
+        for (x, y), content in self._iterTiles(coords, zoom):
+            if content is None:
+                continue
+
+            ext = tileExtension(content)
+            if ext is None:
+                print(f"Skipping tile {x}/{y}/{zoom}: response is not an image")
+                continue
+
+            tileFolder = os.path.join(tileDir, str(zoom), str(x))
+            os.makedirs(tileFolder, exist_ok=True)
+            with open(os.path.join(tileFolder, f"{y}{ext}"), 'wb') as f:
+                f.write(content)
+
+            downloaded += 1
+
+        print(f"Downloaded {downloaded}/{len(coords)} tiles")
+        return tileDir
+
+    def downloadFromCorners(self, corners: List[Tuple[float, float]], zoom: int = None, mapName: str = 'satelliteSnippet',
+                            stitch: bool = True) -> dict:
         """
         Download area defined by 4 corner points
 
         Args:
             corners: List of (lat, lon) tuples for the 4 corners
             mapName: Name for the saved map
+            stitch: Stitch tiles into a single image (see downloadArea)
 
         Returns:
             Dictionary with map information
@@ -216,7 +784,7 @@ class SatelliteMapDownloader:
             'west': min(lons)
         }
 
-        return self.downloadArea(bounds, zoom=zoom, mapName=mapName)
+        return self.downloadArea(bounds, zoom=zoom, mapName=mapName, stitch=stitch)
 
 
 def main():
@@ -254,6 +822,8 @@ def main():
     mapInfo = downloader.downloadFromCorners(
         corners, zoom=17, mapName='cornerBounds')
 
+    downloader.close()
+
 
 if __name__ == '__main__':
     main()
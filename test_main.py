@@ -0,0 +1,232 @@
+import os
+import time
+import asyncio
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+import numpy as np
+from io import BytesIO
+from PIL import Image
+
+from main import SatelliteMapDownloader, RateLimiter, writePng, tileExtension, TILE_SIZE
+
+
+def encodeImage(size, color, fmt='PNG') -> bytes:
+    buf = BytesIO()
+    Image.new('RGB', size, color=color).save(buf, fmt)
+    return buf.getvalue()
+
+
+
+def test_deg2num_matches_saved_metadata(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    # minX/minY recorded in maps/cornerBounds_info.json
+    assert downloader.deg2num(40.7829, -73.9734, 17) == (38603, 49246)
+
+
+def test_num2deg_inverts_deg2num_corner(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    lat, lon = downloader.num2deg(38603, 49246, 17)
+    assert downloader.deg2num(lat, lon, 17) == (38603, 49246)
+
+def test_decodeTile_placeholder_for_missing_or_undecodable_tiles(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    assert downloader.decodeTile(None).getpixel((0, 0)) == (211, 211, 211)
+    assert downloader.decodeTile(b'not an image').getpixel((0, 0)) == (211, 211, 211)
+
+
+def test_decodeTile_resizes_non_standard_tiles(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    tile = downloader.decodeTile(encodeImage((512, 512), 'blue'))
+    assert tile.size == (TILE_SIZE, TILE_SIZE)
+    assert tile.getpixel((0, 0)) == (0, 0, 255)
+
+
+def test_tileExtension_detects_image_format():
+    assert tileExtension(encodeImage((4, 4), 'red')) == '.png'
+    assert tileExtension(encodeImage((4, 4), 'red', 'JPEG')) == '.jpg'
+    assert tileExtension(b'<html></html>') is None
+
+
+def test_cache_rejects_non_image_bytes(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    downloader._writeCachedTile(1, 2, 3, 'googleSat', b'<html>blocked</html>')
+    assert downloader._readCachedTile(1, 2, 3, 'googleSat') is None
+
+    jpeg = encodeImage((TILE_SIZE, TILE_SIZE), 'red', 'JPEG')
+    downloader._writeCachedTile(1, 2, 3, 'googleSat', jpeg)
+    assert downloader._readCachedTile(1, 2, 3, 'googleSat') == jpeg
+    assert os.path.exists(downloader._tileCachePath(1, 2, 3, 'googleSat', '.jpg'))
+
+
+def test_cache_evicts_tiles_that_fail_to_decode(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    truncated = encodeImage((TILE_SIZE, TILE_SIZE), 'red', 'JPEG')[:50]
+    downloader._writeCachedTile(1, 2, 3, 'googleSat', truncated)
+
+    assert downloader._decodeTileAt(1, 2, 3, 'googleSat', truncated) is None
+    assert downloader._readCachedTile(1, 2, 3, 'googleSat') is None
+
+
+def test_pruneCache_evicts_least_recently_used(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    png = encodeImage((TILE_SIZE, TILE_SIZE), 'blue')
+    for y in range(3):
+        downloader._writeCachedTile(0, y, 10, 'googleSat', png)
+        path = downloader._tileCachePath(0, y, 10, 'googleSat', '.png')
+        os.utime(path, (time.time() - 100 + y, time.time() - 100 + y))
+
+    downloader.pruneCache(maxBytes=2*len(png))
+
+    assert downloader._readCachedTile(0, 0, 10, 'googleSat') is None
+    assert downloader._readCachedTile(0, 2, 10, 'googleSat') == png
+
+
+def test_rateLimiter_waits_when_bucket_is_empty():
+    limiter = RateLimiter(maxRate=2.0)
+    waits = [limiter.reserve() for _ in range(3)]
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.4 < waits[2] <= 0.5
+
+
+def test_rateLimiter_backs_off_once_per_window_and_recovers():
+    limiter = RateLimiter(maxRate=50.0)
+    for _ in range(64):
+        limiter.backoff(0)
+    assert limiter.rate == 25.0
+
+    for _ in range(100):
+        limiter.recover()
+    assert limiter.rate == 50.0
+
+
+def test_writePng_roundtrip(tmp_path):
+    pixels = np.random.default_rng(0).integers(0, 256, (300, 257, 3), dtype=np.uint8)
+    path = str(tmp_path / 'out.png')
+    writePng(path, pixels, bandHeight=64)
+    assert np.array_equal(np.asarray(Image.open(path)), pixels)
+
+
+def countTiles(downloader, bounds, zoom):
+    minX, minY = downloader.deg2num(bounds['north'], bounds['west'], zoom)
+    maxX, maxY = downloader.deg2num(bounds['south'], bounds['east'], zoom)
+    return (maxX - minX + 1)*(maxY - minY + 1)
+
+
+def test_calculateZoomLvl_picks_most_detailed_zoom_that_fits(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    bounds = {'north': 40.7829, 'south': 40.7489, 'east': -73.9441, 'west': -73.9734}
+
+    zoom = downloader.calculateZoomLvl(bounds, maxTiles=20)
+
+    assert zoom == 15
+    assert countTiles(downloader, bounds, zoom) <= 20
+    assert countTiles(downloader, bounds, zoom + 1) > 20
+
+
+def test_calculateZoomLvl_zero_area_box(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    bounds = {'north': 40.7829, 'south': 40.7829, 'east': -73.9441, 'west': -73.9734}
+    assert downloader.calculateZoomLvl(bounds, maxTiles=20) == 17
+
+
+def test_calculateZoomLvl_falls_back_to_zoom_10_for_large_areas(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    bounds = {'north': 49.0, 'south': 25.0, 'east': -67.0, 'west': -125.0}
+    assert countTiles(downloader, bounds, 10) > 20
+    assert downloader.calculateZoomLvl(bounds, maxTiles=20) == 10
+
+
+class SequenceAdapter(BaseAdapter):
+    """requests transport adapter replaying a fixed list of (status, headers) responses"""
+
+    def __init__(self, responses, body: bytes):
+        super().__init__()
+        self.responses = list(responses)
+        self.body = body
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        status, headers = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = self.body if status == 200 else b''
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def rateLimitedDownloader(tmp_path, responses, body):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    downloader.limiter = RateLimiter(maxRate=1000.0)
+    adapter = SequenceAdapter(responses, body)
+    downloader.session.mount('http://tiles.test/', adapter)
+    return downloader, adapter
+
+
+def test_downloadTile_retries_after_429(tmp_path):
+    png = encodeImage((TILE_SIZE, TILE_SIZE), 'red')
+    downloader, adapter = rateLimitedDownloader(
+        tmp_path, [(429, {'Retry-After': '0.2'}), (200, {})], png)
+
+    start = time.monotonic()
+    content = downloader.downloadTile(1, 2, 3, url='http://tiles.test/1/2/3')
+
+    assert content == png
+    assert adapter.calls == 2
+    assert time.monotonic() - start >= 0.2
+    # Halved once by the 429, then nudged back up by the success
+    assert downloader.limiter.rate == 501.0
+
+
+def test_downloadTile_gives_up_after_maxRateLimitRetries(tmp_path):
+    downloader, adapter = rateLimitedDownloader(tmp_path, [(429, {'Retry-After': '0'})], b'')
+
+    assert downloader.downloadTile(1, 2, 3, url='http://tiles.test/1/2/3') is None
+    assert adapter.calls == downloader.maxRateLimitRetries + 1
+
+
+def fetchTileAsync(downloader, responses, body):
+    httpx = pytest.importorskip('httpx')
+    calls = []
+
+    def handler(request):
+        status, headers = responses[min(len(calls), len(responses) - 1)]
+        calls.append(request)
+        return httpx.Response(status, headers=headers, content=body if status == 200 else b'')
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await downloader._fetchTile(client, asyncio.Semaphore(1), 1, 2, 3,
+                                               'http://tiles.test/1/2/3', 'googleSat')
+
+    return asyncio.run(run()), len(calls)
+
+
+def test_fetchTile_retries_after_429(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    downloader.limiter = RateLimiter(maxRate=1000.0)
+    png = encodeImage((TILE_SIZE, TILE_SIZE), 'red')
+
+    start = time.monotonic()
+    content, calls = fetchTileAsync(downloader, [(429, {'Retry-After': '0.2'}), (200, {})], png)
+
+    assert content == png
+    assert calls == 2
+    assert time.monotonic() - start >= 0.2
+    assert downloader.limiter.rate == 501.0
+
+
+def test_fetchTile_gives_up_after_maxRateLimitRetries(tmp_path):
+    downloader = SatelliteMapDownloader(str(tmp_path))
+    downloader.limiter = RateLimiter(maxRate=1000.0)
+
+    content, calls = fetchTileAsync(downloader, [(429, {'Retry-After': '0'})], b'')
+
+    assert content is None
+    assert calls == downloader.maxRateLimitRetries + 1